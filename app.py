@@ -5,6 +5,7 @@ Aplicação Web Flask para Validação de Arquivos CNAB400 Bradesco
 from flask import Flask, render_template, request, jsonify, send_file
 import os
 import tempfile
+import threading
 import json
 from validator import validate_file
 from layouts.bradesco_cnab400 import set_current_century, set_validate_nosso_numero
@@ -13,17 +14,56 @@ app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max
 app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
 
+# Controle de admissão: uploads pequenos vão para a faixa rápida e arquivos grandes
+# para uma faixa pesada com concorrência limitada, para que poucos arquivos de 16MB
+# não ocupem todas as threads. Limites por processo (ver Procfile: workers gthread).
+app.config['FAST_LANE_MAX_BYTES'] = int(os.environ.get('CNAB_FAST_LANE_MAX_BYTES', 1024 * 1024))
+app.config['FAST_LANE_SLOTS'] = int(os.environ.get('CNAB_FAST_LANE_SLOTS', 6))
+app.config['HEAVY_LANE_SLOTS'] = int(os.environ.get('CNAB_HEAVY_LANE_SLOTS', 1))
+app.config['FAST_LANE_BUDGET_S'] = float(os.environ.get('CNAB_FAST_LANE_BUDGET_S', 5))
+app.config['HEAVY_LANE_BUDGET_S'] = float(os.environ.get('CNAB_HEAVY_LANE_BUDGET_S', 20))
+app.config['ADMISSION_WAIT_S'] = float(os.environ.get('CNAB_ADMISSION_WAIT_S', 0.5))
+app.config['RETRY_AFTER_S'] = int(os.environ.get('CNAB_RETRY_AFTER_S', 5))
+
 ALLOWED_EXTENSIONS = {'REM', 'rem', 'txt', 'TXT'}
 
+LANES = {
+    'rapida': threading.BoundedSemaphore(app.config['FAST_LANE_SLOTS']),
+    'pesada': threading.BoundedSemaphore(app.config['HEAVY_LANE_SLOTS']),
+}
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1] in ALLOWED_EXTENSIONS
 
+def select_lane(content_length):
+    """Escolhe a faixa pelo tamanho declarado da requisição (sem Content-Length => pesada)."""
+    if content_length is not None and content_length <= app.config['FAST_LANE_MAX_BYTES']:
+        return 'rapida'
+    return 'pesada'
+
+def too_busy(lane):
+    response = jsonify({'error': f'Servidor ocupado (faixa {lane}). Tente novamente em instantes.'})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(app.config['RETRY_AFTER_S'])
+    return response
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
 @app.route('/validar', methods=['POST'])
 def validar():
+    # Admissão antes de ler o corpo: se a faixa estiver cheia, recusa sem consumir o upload
+    lane = select_lane(request.content_length)
+    slot = LANES[lane]
+    if not slot.acquire(timeout=app.config['ADMISSION_WAIT_S']):
+        return too_busy(lane)
+    try:
+        return _validar(lane)
+    finally:
+        slot.release()
+
+def _validar(lane):
     if 'arquivo' not in request.files:
         return jsonify({'error': 'Nenhum arquivo enviado'}), 400
     
@@ -35,11 +75,13 @@ def validar():
     if not allowed_file(file.filename):
         return jsonify({'error': 'Tipo de arquivo não permitido. Use .REM ou .txt'}), 400
     
-    # Salvar arquivo temporário
-    temp_path = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
-    file.save(temp_path)
-    
+    # Salvar arquivo temporário com nome exclusivo (uploads simultâneos com o mesmo nome não colidem)
+    fd, temp_path = tempfile.mkstemp(suffix='.' + file.filename.rsplit('.', 1)[1], dir=app.config['UPLOAD_FOLDER'])
+
     try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            file.save(temp_file)
+
         # Parâmetros opcionais
         seculo_base = int(request.form.get('seculo_base', 2000))
         tolerancia = int(request.form.get('tolerancia_centavos', 0))
@@ -51,7 +93,8 @@ def validar():
         set_validate_nosso_numero(validar_dv)
         
         # Executar validação
-        result = validate_file(temp_path, tolerancia_centavos=tolerancia)
+        budget = app.config['FAST_LANE_BUDGET_S'] if lane == 'rapida' else app.config['HEAVY_LANE_BUDGET_S']
+        result = validate_file(temp_path, tolerancia_centavos=tolerancia, time_budget=budget)
         
         # Filtrar por severidade
         severity_order = {'fatal': 0, 'business': 1, 'field': 2}
@@ -81,8 +124,10 @@ def validar():
         # Preparar resposta
         response = {
             'valid': result.valid and len(errors_filtered) == 0,
+            'truncated': result.truncated,
             'filename': file.filename,
             'total_linhas': total_linhas,
+            'linhas_validadas': result.lines_processed,
             'total_erros': len(errors_filtered),
             'erros': errors_filtered,
             'resumo': {
@@ -113,5 +158,5 @@ def download_exemplo():
 
 if __name__ == '__main__':
     # Rodar em modo desenvolvimento
-    # Para produção use: gunicorn -w 4 -b 0.0.0.0:5000 app:app
+    # Para produção use: gunicorn -k gthread -w 2 --threads 8 -b 0.0.0.0:5000 app:app
     app.run(host='0.0.0.0', port=5000, debug=True)
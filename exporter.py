@@ -0,0 +1,220 @@
+"""Exportação dos registros de detalhe (Tipo 1) para CSV, Parquet ou Arrow IPC.
+
+Os exportadores recebem o contexto já extraído por `validate_line` (ver `validate_file(..., exporters=[...])`),
+então o arquivo é lido uma única vez para validação e exportação. Os registros são acumulados
+em colunas e gravados em lotes com tipos fixos:
+
+- valores (13,2) e percentual_multa (4,2): inteiro em centésimos (ex: valor_titulo=12345 => R$ 123,45)
+- datas: ISO 8601 (AAAA-MM-DD), respeitando o século base configurado
+- sequencial_registro: inteiro
+- demais campos: texto sem espaços nas bordas
+
+Valores em branco viram 0 (como no validador); campos inválidos (ex: não numéricos) ou ausentes são
+exportados como nulo. Campos tipados cujas posições se sobrepõem a outro campo do layout não são
+exportados (EXCLUDED_OVERLAPPING).
+Parquet/Arrow exigem `pyarrow` (opcional).
+"""
+import csv
+import re
+from typing import Any, Dict, List, Optional
+from layouts.bradesco_cnab400 import (
+    REGISTRO1_FIELDS, amount_13_2_safe, amount_13_2_optional_digits,
+    parse_date_ddmmaa, parse_date_optional, sequencial_tolerante,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dependência opcional
+    pa = None
+    pq = None
+
+DEFAULT_BATCH_SIZE = 10000
+REAG_SEQUENCIAL_RE = re.compile(r'BR\d{4}')
+
+KIND_CENTS = 'centavos'
+KIND_DATE = 'data'
+KIND_INT = 'inteiro'
+KIND_STR = 'texto'
+
+def _field_kind(spec) -> str:
+    if spec.transform in (amount_13_2_safe, amount_13_2_optional_digits) or spec.name == 'percentual_multa':
+        return KIND_CENTS
+    if spec.transform in (parse_date_ddmmaa, parse_date_optional):
+        return KIND_DATE
+    if spec.transform is sequencial_tolerante:
+        return KIND_INT
+    return KIND_STR
+
+def _overlapping_specs(specs) -> Dict[str, List[str]]:
+    """Mapeia cada campo aos outros campos do layout cujas posições se sobrepõem às dele."""
+    overlaps: Dict[str, List[str]] = {}
+    for a in specs:
+        for b in specs:
+            if a is not b and a.start <= b.end and b.start <= a.end:
+                overlaps.setdefault(a.name, []).append(b.name)
+    return overlaps
+
+def _build_columns(specs):
+    """Define as colunas exportadas a partir do layout.
+
+    O validador tolera campos com posições sobrepostas, mas a exportação não pode publicar bytes
+    de outro campo como valor/data/número: campos tipados sobrepostos ficam de fora (ver
+    EXCLUDED_OVERLAPPING). Dois campos texto sobrepostos não têm desempate seguro => ValueError.
+    """
+    candidates = [spec for spec in specs if not spec.name.startswith('filler') and spec.name != 'identificacao_registro']
+    overlaps = _overlapping_specs(specs)
+    kinds = {spec.name: _field_kind(spec) for spec in specs}
+    columns, excluded = [], []
+    for spec in candidates:
+        kind = kinds[spec.name]
+        if spec.name in overlaps:
+            if kind != KIND_STR:
+                excluded.append(spec.name)
+                continue
+            clash = [o for o in overlaps[spec.name] if kinds[o] == KIND_STR and not o.startswith('filler')]
+            if clash:
+                raise ValueError(f'campos texto sobrepostos no layout: {spec.name} x {", ".join(clash)}')
+        columns.append((spec.name, kind))
+    return [('linha', KIND_INT)] + columns, excluded
+
+# (nome, tipo) de cada coluna exportada; fillers, identificação do registro e campos tipados com
+# posições sobrepostas (hoje valor_iof e valor_abatimento, que invadem o bloco do pagador) ficam de fora
+COLUMNS, EXCLUDED_OVERLAPPING = _build_columns(REGISTRO1_FIELDS)
+
+def _value(name: str, kind: str, ctx: Dict[str, Any]):
+    if kind == KIND_CENTS:
+        # inteiro direto do texto (sem passar por float): branco => 0, qualquer outro não-dígito => nulo
+        if name not in ctx:
+            return None
+        raw = ctx.get(f"__raw__{name}", '').strip()
+        if raw == '':
+            return 0
+        return int(raw) if raw.isdigit() else None
+    if kind == KIND_INT:
+        # não usa o transform: sequencial_tolerante devolve 0 para texto inválido
+        raw = ctx.get(f"__raw__{name}", '').strip()
+        if raw.isdigit():
+            return int(raw)
+        if REAG_SEQUENCIAL_RE.fullmatch(raw) and ctx.get(name) == int(raw[2:]):
+            return int(raw[2:])  # formato BRnnnn aceito pelo layout (banco 528)
+        return None
+    val = ctx.get(name)
+    if kind == KIND_DATE:
+        return val.date() if val else None
+    val = val.strip() if val else ''
+    return val or None
+
+
+class BatchExporter:
+    """Base dos exportadores: acumula colunas e delega a gravação de cada lote a `_write_batch`."""
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        if batch_size < 1:
+            raise ValueError(f'batch_size deve ser >= 1 (recebido {batch_size})')
+        self.path = path
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._columns: List[List[Any]] = [[] for _ in COLUMNS]
+        self._pending = 0
+
+    def add(self, line_num: int, ctx: Dict[str, Any]):
+        self._columns[0].append(line_num)
+        for col, (name, kind) in zip(self._columns[1:], COLUMNS[1:]):
+            col.append(_value(name, kind, ctx))
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        self._write_batch(self._columns)
+        self.rows_written += self._pending
+        self._columns = [[] for _ in COLUMNS]
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write_batch(self, columns: List[List[Any]]):
+        raise NotImplementedError
+
+    def _close(self):
+        raise NotImplementedError
+
+
+class CsvExporter(BatchExporter):
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        super().__init__(path, batch_size)
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, _ in COLUMNS])
+
+    def _write_batch(self, columns):
+        self._writer.writerows(zip(*columns))  # None => '' e date => AAAA-MM-DD
+
+    def _close(self):
+        self._file.close()
+
+
+def _arrow_schema():
+    types = {KIND_CENTS: pa.int64(), KIND_DATE: pa.date32(), KIND_INT: pa.int64(), KIND_STR: pa.string()}
+    return pa.schema([(name, types[kind]) for name, kind in COLUMNS])
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError('pyarrow não instalado (pip install pyarrow) - necessário para Parquet/Arrow')
+
+
+class ArrowExporter(BatchExporter):
+    """Grava Arrow IPC (formato arquivo, .arrow/.feather v2)."""
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        _require_pyarrow()
+        super().__init__(path, batch_size)
+        self._schema = _arrow_schema()
+        self._writer = self._open_writer()
+
+    def _open_writer(self):
+        return pa.ipc.new_file(self.path, self._schema)
+
+    def _record_batch(self, columns):
+        return pa.RecordBatch.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(columns, self._schema)],
+            schema=self._schema,
+        )
+
+    def _write_batch(self, columns):
+        self._writer.write_batch(self._record_batch(columns))
+
+    def _close(self):
+        self._writer.close()
+
+
+class ParquetExporter(ArrowExporter):
+    def _open_writer(self):
+        return pq.ParquetWriter(self.path, self._schema)
+
+    def _write_batch(self, columns):
+        self._writer.write_table(pa.Table.from_batches([self._record_batch(columns)]))
+
+
+EXPORTERS = {
+    'csv': CsvExporter,
+    'parquet': ParquetExporter,
+    'arrow': ArrowExporter,
+}
+
+def open_exporter(path: str, formato: str, batch_size: Optional[int] = None) -> BatchExporter:
+    """Cria o exportador para `formato` ('csv', 'parquet' ou 'arrow')."""
+    if formato not in EXPORTERS:
+        raise ValueError(f'formato de exportação inválido: {formato}')
+    return EXPORTERS[formato](path, DEFAULT_BATCH_SIZE if batch_size is None else batch_size)
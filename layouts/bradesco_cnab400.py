@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import Callable, Optional, Any
 import re
+import threading
 from datetime import datetime
 
 # ================= Utilitários Globais =================
@@ -21,6 +22,14 @@ DATE_RE = re.compile(r'\d{6}')
 NUM_RE = re.compile(r'\d+')
 AMOUNT_13_2_RE = re.compile(r'\d{13}')
 
+# Configuração por thread: o app web roda com workers gthread, então duas
+# requisições simultâneas não podem compartilhar século/banco/DV. Os valores
+# globais acima ficam como padrão para threads que nunca chamaram os setters.
+_THREAD_CONFIG = threading.local()
+
+def _config(name: str, default):
+    return getattr(_THREAD_CONFIG, name, default)
+
 def amount_13_2_optional_digits(v: str):
     v=v.strip()
     if v and v.isdigit():
@@ -47,7 +56,7 @@ def sequencial_tolerante(v: str):
         return int(v)
     
     # Se banco for 528 (REAG), aceita formato BRnnnn
-    if CODIGO_BANCO == '528':
+    if _config('codigo_banco', CODIGO_BANCO) == '528':
         # Formato específico REAG: BR + 4 dígitos
         if v.startswith('BR') and len(v) == 6:
             digits = v[2:]  # Pega apenas os 4 dígitos após "BR"
@@ -65,7 +74,7 @@ def sequencial_tolerante(v: str):
 # Transforms seguros -----------------------------------------------------------
 
 def parse_date_ddmmaa(v: str) -> datetime:
-    d = int(v[0:2]); m = int(v[2:4]); a = int(v[4:6]) + CURRENT_CENTURY
+    d = int(v[0:2]); m = int(v[2:4]); a = int(v[4:6]) + _config('century', CURRENT_CENTURY)
     return datetime(a, m, d)
 
 def parse_date_optional(v: str):
@@ -82,23 +91,20 @@ def amount_13_2_safe(v: str):
     return int(v) / 100
 
 def set_current_century(century_base: int):
-    """Define o século base (ex: 1900 ou 2000) usado nas datas de 2 dígitos."""
-    global CURRENT_CENTURY
+    """Define o século base (ex: 1900 ou 2000) usado nas datas de 2 dígitos (thread atual)."""
     if century_base not in (1900, 2000):
         # permitir qualquer valor entre 1800 e 2099 para flexibilidade
         if not (1800 <= century_base <= 2099):
             raise ValueError('século base inválido')
-    CURRENT_CENTURY = century_base
+    _THREAD_CONFIG.century = century_base
 
 def set_validate_nosso_numero(flag: bool):
-    """Ativa/desativa validação de DV do Nosso Número Bradesco."""
-    global VALIDATE_NOSSO_NUMERO
-    VALIDATE_NOSSO_NUMERO = bool(flag)
+    """Ativa/desativa validação de DV do Nosso Número Bradesco (thread atual)."""
+    _THREAD_CONFIG.validate_nosso_numero = bool(flag)
 
 def set_codigo_banco(codigo: str):
-    """Define o código do banco para validações condicionais (ex: sequencial REAG)."""
-    global CODIGO_BANCO
-    CODIGO_BANCO = codigo.strip() if codigo else None
+    """Define o código do banco para validações condicionais (ex: sequencial REAG) na thread atual."""
+    _THREAD_CONFIG.codigo_banco = codigo.strip() if codigo else None
 
 # ================= Especificação de Campo =================
 @dataclass
@@ -306,7 +312,7 @@ def compute_bradesco_nosso_numero_dv(base11: str) -> str:
     return str(dv)
 
 def validar_nosso_numero(raw: str, ctx: dict):
-    if not VALIDATE_NOSSO_NUMERO:
+    if not _config('validate_nosso_numero', VALIDATE_NOSSO_NUMERO):
         return None
     # raw já deve ter 12 dígitos: 11 base + DV
     if len(raw) != 12 or not raw.isdigit():
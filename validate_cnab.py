@@ -1,7 +1,15 @@
 import argparse, json, sys
+from contextlib import ExitStack
 from validator import validate_file
+from exporter import open_exporter
 from layouts.bradesco_cnab400 import set_current_century, set_validate_nosso_numero
 
+def inteiro_positivo(valor):
+    n = int(valor)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f'deve ser >= 1 (recebido {valor})')
+    return n
+
 def main():
     parser = argparse.ArgumentParser(description='Validador CNAB400 Bradesco (MVP)')
     parser.add_argument('arquivo')
@@ -10,14 +18,23 @@ def main():
     parser.add_argument('--tolerancia-centavos', type=int, default=0, help='Tolerância nos comparativos de totais (em centavos).')
     parser.add_argument('--min-severidade', choices=['fatal','field','business'], default='field', help='Filtra erros exibidos >= severidade informada.')
     parser.add_argument('--validar-nosso-numero', action='store_true', help='Ativa validação do DV do Nosso Número Bradesco.')
+    parser.add_argument('--exportar-csv', metavar='ARQUIVO', help='Exporta os registros Tipo 1 em CSV (valores em centavos, datas ISO).')
+    parser.add_argument('--exportar-parquet', metavar='ARQUIVO', help='Exporta os registros Tipo 1 em Parquet (requer pyarrow).')
+    parser.add_argument('--exportar-arrow', metavar='ARQUIVO', help='Exporta os registros Tipo 1 em Arrow IPC (requer pyarrow).')
+    parser.add_argument('--lote-exportacao', type=inteiro_positivo, default=None, help='Registros por lote gravado na exportação.')
     args = parser.parse_args()
-    try:
-        set_current_century(args.seculo_base)
-        set_validate_nosso_numero(args.validar_nosso_numero)
-    except Exception as e:
-        print(f'Erro: {e}', file=sys.stderr)
-        sys.exit(2)
-    res = validate_file(args.arquivo, tolerancia_centavos=args.tolerancia_centavos)
+    destinos = [(caminho, formato) for caminho, formato in [
+        (args.exportar_csv, 'csv'), (args.exportar_parquet, 'parquet'), (args.exportar_arrow, 'arrow'),
+    ] if caminho]
+    with ExitStack() as stack:
+        try:
+            set_current_century(args.seculo_base)
+            set_validate_nosso_numero(args.validar_nosso_numero)
+            exporters = [stack.enter_context(open_exporter(caminho, formato, args.lote_exportacao)) for caminho, formato in destinos]
+        except Exception as e:
+            print(f'Erro: {e}', file=sys.stderr)
+            sys.exit(2)
+        res = validate_file(args.arquivo, tolerancia_centavos=args.tolerancia_centavos, exporters=exporters)
     severidade_ordem = {'fatal':0,'field':1,'business':2}
     corte = severidade_ordem[args.min_severidade]
     filtered = [e for e in res.errors if severidade_ordem.get(e.get('severity','field'),1) <= corte]
@@ -1,10 +1,16 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 from layouts.bradesco_cnab400 import FIELD_MAP, FieldSpec, RECORD_LEVEL_VALIDATORS, set_codigo_banco
 from decimal import Decimal
+import time
+
+# Frequência (em linhas) da checagem do orçamento de tempo; evita chamar o relógio a cada linha
+BUDGET_CHECK_INTERVAL = 256
 
 class ValidationResult:
     def __init__(self):
         self.errors: List[Dict[str, Any]] = []
+        self.truncated = False  # True quando o orçamento de tempo acabou antes do fim do arquivo
+        self.lines_processed = 0
     @property
     def valid(self):
         return len(self.errors) == 0
@@ -63,14 +69,23 @@ def validate_line(line: str, line_num: int, result: ValidationResult):
                 result.add(line_num, record_type, e)
         except Exception as ex:
             result.add(line_num, record_type, {'field': '__record__', 'error': 'record_validator_exception', 'detail': str(ex)})
+    return context
 
 
-def validate_file(path: str, tolerancia_centavos: int = 0) -> ValidationResult:
+def validate_file(path: str, tolerancia_centavos: int = 0, time_budget: Optional[float] = None, exporters: Sequence[Any] = ()) -> ValidationResult:
     """Valida arquivo CNAB400.
 
     tolerancia_centavos: diferença máxima (em centavos) permitida entre total declarado e somado.
+    time_budget: tempo máximo (segundos) de validação. Ao estourar, a leitura para, o resultado
+    parcial é devolvido com `truncated=True` e as checagens de trailer/totais são omitidas.
+    exporters: exportadores (ver exporter.py) que recebem cada registro Tipo 1 já extraído, com o
+    mesmo critério da contagem de títulos (linha de 400 posições). Abrir e fechar os exportadores é
+    responsabilidade de quem chama. Não pode ser combinado com time_budget (exportação parcial).
     """
+    if exporters and time_budget is not None:
+        raise ValueError('exporters e time_budget não podem ser usados juntos (a exportação ficaria parcial)')
     result = ValidationResult()
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
     lines_cache = []
     total_valores = Decimal('0')
     total_abatimento = Decimal('0')
@@ -84,6 +99,9 @@ def validate_file(path: str, tolerancia_centavos: int = 0) -> ValidationResult:
     
     with open(path, 'r', encoding='latin1') as f:
         for idx, raw_line in enumerate(f, start=1):
+            if deadline is not None and idx % BUDGET_CHECK_INTERVAL == 0 and time.monotonic() > deadline:
+                result.truncated = True
+                break
             line = raw_line.rstrip('\n').rstrip('\r')
             lines_cache.append(line)
             
@@ -92,9 +110,11 @@ def validate_file(path: str, tolerancia_centavos: int = 0) -> ValidationResult:
                 codigo_banco = line[76:79]  # posições 77-79 (índice 76-78)
                 set_codigo_banco(codigo_banco)
             
-            validate_line(line, idx, result)
+            context = validate_line(line, idx, result)
             if len(line) == 400 and line.startswith('1'):
                 titulos_count += 1
+                for exporter in exporters:
+                    exporter.add(idx, context)
                 valor_raw = line[126:139]
                 if valor_raw.isdigit():
                     total_valores += Decimal(valor_raw) / Decimal('100')
@@ -113,13 +133,17 @@ def validate_file(path: str, tolerancia_centavos: int = 0) -> ValidationResult:
                 # outros permanece zero (placeholder)
             if len(line) == 400 and line.startswith('9'):
                 trailer_line = (idx, line)
+    result.lines_processed = len(lines_cache)
     if not lines_cache:
         result.add_global({'error': 'empty_file'})
         return result
     # Structural checks
     if lines_cache[0][:1] != '0':
         result.add_global({'error': 'missing_header_first_line'})
-    if lines_cache[-1][:1] != '9':
+    if result.truncated:
+        # Trailer e totais não foram lidos: comparar somas parciais geraria falsos positivos
+        result.add_global({'error': 'validation_truncated', 'lines_processed': result.lines_processed, 'severity': 'fatal'})
+    elif lines_cache[-1][:1] != '9':
         result.add_global({'error': 'missing_trailer_last_line'})
     if titulos_count == 0:
         result.add_global({'error': 'no_detail_records_tipo1'})
@@ -134,7 +158,7 @@ def validate_file(path: str, tolerancia_centavos: int = 0) -> ValidationResult:
                     result.add_global({'error': 'non_increasing_sequencial_registro', 'line': idx, 'found': seq_int, 'previous': last_seq})
                 last_seq = seq_int
     # Trailer validations
-    if trailer_line:
+    if trailer_line and not result.truncated:
         t_idx, t = trailer_line
         raw_total_registros = t[1:7]
         if raw_total_registros.strip():